@@ -1,7 +1,7 @@
 const express = require('express');
 const router = express.Router();
-const { PrismaClient } = require('@prisma/client');
-const prisma = new PrismaClient();
+const prisma = require('../utils/prisma');
+const getPriceRange = require('../utils/price_range');
 
 // Get shopping cart
 router.get('/', async (req, res) => {
@@ -71,6 +71,12 @@ async function fetchOrCreateCart(user_id, txClient = null) {
         await ensureCart(user_id, txClient);
         return getCartWithDetails(user_id, txClient);
     } else {
+        // Most users already have a cart, so try a plain read before opening a transaction
+        const existingCart = await getCartWithDetails(user_id, prisma);
+        if (existingCart) {
+            return existingCart;
+        }
+
         // Not in a transaction, handle with our own transaction
         return prisma.$transaction(async (tx) => {
             await ensureUser(user_id, tx);
@@ -131,11 +137,10 @@ async function getCartWithDetails(user_id, client) {
 
     if (!cart) return null;
 
-    const prices = cart.cart_items.flatMap(cartItem =>
-        cartItem.products.product_store.map(ps => ps.price)
+    const { min_price, max_price } = getPriceRange(
+        cart.cart_items.flatMap(cartItem => cartItem.products.product_store),
+        0
     );
-    const min_price = prices.length ? Math.min(...prices) : 0;
-    const max_price = prices.length ? Math.max(...prices) : 0;
 
     return {
         ...cart,
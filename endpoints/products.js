@@ -1,9 +1,9 @@
 const express = require('express');
 const router = express.Router();
-const { PrismaClient } = require('@prisma/client');
-const prisma = new PrismaClient();
+const prisma = require('../utils/prisma');
 const path = require('path');
 const resizeImage = require('../utils/resize_image');
+const getPriceRange = require('../utils/price_range');
 
 // Product suggestions endpoint
 router.get('/suggestions', async (req, res) => {
@@ -94,9 +94,7 @@ router.get('/search', async (req, res) => {
         });
 
         const productsWithPrices = products.map(product => {
-            const prices = product.product_store.map(ps => ps.price);
-            const min_price = Math.min(...prices);
-            const max_price = Math.max(...prices);
+            const { min_price, max_price } = getPriceRange(product.product_store);
 
             return {
                 product_id: product.product_id,
@@ -140,9 +138,7 @@ router.get('/product', async (req, res) => {
         }
 
         // Calculate min and max prices from product_store table
-        const prices = product.product_store.map(ps => ps.price);
-        const min_price = Math.min(...prices);
-        const max_price = Math.max(...prices);
+        const { min_price, max_price } = getPriceRange(product.product_store);
 
         // Prepare response data
         const responseData = {
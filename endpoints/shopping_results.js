@@ -1,8 +1,7 @@
 const express = require('express');
 const router = express.Router();
 const calculateDistance = require('../utils/calculate_distances');
-const { PrismaClient } = require('@prisma/client');
-const prisma = new PrismaClient();
+const prisma = require('../utils/prisma');
 
 // Shopping results endpoint
 router.get('/', async (req, res) => {
@@ -0,0 +1,17 @@
+// Min and max price over product_store rows in a single pass, without spreading into Math.min/max
+function getPriceRange(product_stores, empty_price = null) {
+    if (product_stores.length === 0) {
+        return { min_price: empty_price, max_price: empty_price };
+    }
+
+    let min_price = Infinity;
+    let max_price = -Infinity;
+    for (const ps of product_stores) {
+        if (ps.price < min_price) min_price = ps.price;
+        if (ps.price > max_price) max_price = ps.price;
+    }
+
+    return { min_price, max_price };
+}
+
+module.exports = getPriceRange;
@@ -0,0 +1,6 @@
+// Single PrismaClient shared by all routers so the app keeps one connection pool
+const { PrismaClient } = require('@prisma/client');
+
+const prisma = new PrismaClient();
+
+module.exports = prisma;
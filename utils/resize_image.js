@@ -1,44 +1,134 @@
 // This function is available in the backend but not being used in the frontend currently, it shall be updated in the future.
 
+const http = require('http');
+const https = require('https');
+const { pipeline } = require('stream/promises');
 const sharp = require('sharp');
 
 let storage, bucket;
 const bucket_name = process.env.GCLOUD_STORAGE_BUCKET;
 
-// Only initialize Google Cloud Storage if bucket name is provided
-if (bucket_name) {
-    const { Storage } = require('@google-cloud/storage');
-    storage = new Storage();
-    bucket = storage.bucket(bucket_name);
+if (!bucket_name) {
+    console.log('Google Cloud Storage not configured, image resizing is disabled');
 }
 
-async function resize_image_async(image_url, image_name) {
+// Load and build the storage client on first use so startup doesn't pay for it
+const get_bucket = () => {
+    if (!bucket) {
+        const { Storage } = require('@google-cloud/storage');
+        storage = new Storage();
+        bucket = storage.bucket(bucket_name);
+    }
+    return bucket;
+};
+
+// Reuse sockets across image fetches instead of a new TCP+TLS handshake per call
+const http_agent = new http.Agent({ keepAlive: true });
+const https_agent = new https.Agent({ keepAlive: true });
+const select_agent = (parsed_url) => parsed_url.protocol === 'http:' ? http_agent : https_agent;
+
+// node-fetch is ESM-only; import it once and share the promise
+let fetch_promise;
+const get_fetch = () => {
+    if (!fetch_promise) {
+        fetch_promise = import('node-fetch').then(module => module.default);
+    }
+    return fetch_promise;
+};
+
+// Resizes currently running, keyed by target name, so concurrent requests share one download
+const in_flight = new Map();
+
+// Thumbnails known to be in the bucket, so repeat calls skip the exists() round trip
+const known_resized = new Set();
+
+// Source URLs that recently failed to fetch (error status, network error or timeout),
+// mapped to when they may be retried
+const FAILED_URL_TTL_MS = 10 * 60 * 1000;
+const failed_urls = new Map();
+
+const mark_failed = (image_url) => failed_urls.set(image_url, Date.now() + FAILED_URL_TTL_MS);
+
+const recently_failed = (image_url) => {
+    const retry_at = failed_urls.get(image_url);
+    if (retry_at === undefined) {
+        return false;
+    }
+    if (retry_at > Date.now()) {
+        return true;
+    }
+    // Drop stale entries so the map doesn't keep URLs that are no longer failing
+    failed_urls.delete(image_url);
+    return false;
+};
+
+// Upper bound on fetching a source image, so a stalled host doesn't hold the socket indefinitely
+const FETCH_TIMEOUT_MS = 30 * 1000;
+
+function resize_image_async(image_url, image_name) {
+    // Skip image processing if Google Cloud Storage is not configured
+    if (!bucket_name) {
+        return Promise.resolve();
+    }
+
+    const resized_image_name = `160x160-${image_name}`;
+    if (known_resized.has(resized_image_name)) {
+        return Promise.resolve();
+    }
+    if (recently_failed(image_url)) {
+        return Promise.resolve();
+    }
+    if (in_flight.has(resized_image_name)) {
+        return in_flight.get(resized_image_name);
+    }
+
+    const task = resize_and_upload(image_url, resized_image_name)
+        .finally(() => in_flight.delete(resized_image_name));
+    in_flight.set(resized_image_name, task);
+    return task;
+}
+
+async function resize_and_upload(image_url, resized_image_name) {
     try {
-        // Skip image processing if Google Cloud Storage is not configured
-        if (!bucket_name || !bucket) {
-            console.log('Google Cloud Storage not configured, skipping image resize');
+        const resized_image_blob = get_bucket().file(resized_image_name);
+
+        // Skip the download entirely if this image was already resized
+        const [exists] = await resized_image_blob.exists();
+        if (exists) {
+            known_resized.add(resized_image_name);
             return;
         }
 
-        const fetch = (await import('node-fetch')).default;
-        const response = await fetch(image_url);
+        const fetch = await get_fetch();
+        let response;
+        try {
+            response = await fetch(image_url, {
+                agent: select_agent,
+                signal: AbortSignal.timeout(FETCH_TIMEOUT_MS)
+            });
+        } catch (err) {
+            // Unreachable host or timeout before the response arrived
+            mark_failed(image_url);
+            throw err;
+        }
         if (!response.ok) {
+            mark_failed(image_url);
             throw new Error(`Failed to fetch image from URL: ${image_url}`);
         }
-        const buffer = await response.buffer();
-
-        const resized_buffer = await sharp(buffer)
-            .resize(160, 160)
-            .toBuffer();
-
-        const resized_image_name = `160x160-${image_name}`;
-        const resized_image_blob = bucket.file(resized_image_name);
 
-        const [exists] = await resized_image_blob.exists();
-        if (!exists) {
-            await resized_image_blob.save(resized_buffer);
-        }
+        // Stream straight from the HTTP response through sharp into storage
+        await pipeline(
+            response.body,
+            sharp().resize(160, 160),
+            // Thumbnails are a few KB; a single-request upload avoids the resumable session round trip
+            resized_image_blob.createWriteStream({ resumable: false })
+        );
+        known_resized.add(resized_image_name);
     } catch (err) {
+        // The fetch timeout can also fire while the body is still streaming
+        if (err.name === 'AbortError') {
+            mark_failed(image_url);
+        }
         console.error('Image resizing error:', err.message);
     }
 }